@@ -241,9 +241,17 @@ https://fmriprep.readthedocs.io/en/%s/spaces.html""" % (
                              action='store_false', dest='run_reconall',
                              help='disable FreeSurfer surface preprocessing.')
 
+    # Keep intermediate results on tmpfs (RAM) if requested and available
+    default_work_dir = Path('work')
+    use_shm = os.getenv('FMRIPREP_USE_SHM', '0').lower() in ('1', 'true', 'yes')
+    if use_shm and Path('/dev/shm').is_dir():
+        default_work_dir = Path('/dev/shm') / ('fmriprep_%d' % os.getuid())
+
     g_other = parser.add_argument_group('Other options')
-    g_other.add_argument('-w', '--work-dir', action='store', type=Path, default=Path('work'),
-                         help='path where intermediate results should be stored')
+    g_other.add_argument('-w', '--work-dir', action='store', type=Path, default=default_work_dir,
+                         help='path where intermediate results should be stored '
+                              '(if the FMRIPREP_USE_SHM environment variable is set to '
+                              '1, true or yes, defaults to a folder under /dev/shm)')
     g_other.add_argument(
         '--resource-monitor', action='store_true', default=False,
         help='enable Nipype\'s resource monitoring to keep track of memory and CPU usage')
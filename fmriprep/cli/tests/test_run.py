@@ -1,4 +1,5 @@
 """Test CLI."""
+from pathlib import Path
 from packaging.version import Version
 import pytest
 from .. import version as _version
@@ -49,3 +50,24 @@ def test_get_parser_blacklist(monkeypatch, capsys, flagged):
     assert ('FLAGGED' in captured) is flagged[0]
     if flagged[0]:
         assert ((flagged[1] or 'reason: unknown') in captured)
+
+
+@pytest.mark.skipif(not Path('/dev/shm').is_dir(), reason='no tmpfs at /dev/shm')
+@pytest.mark.parametrize(('env_value', 'use_shm'), [
+    ('1', True),
+    ('True', True),
+    ('0', False),
+    (None, False),
+])
+def test_get_parser_shm_work_dir(monkeypatch, env_value, use_shm):
+    """Make sure FMRIPREP_USE_SHM moves the default working directory to tmpfs."""
+    monkeypatch.setattr(_version, 'check_latest', lambda *args, **kwargs: None)
+    if env_value is None:
+        monkeypatch.delenv('FMRIPREP_USE_SHM', raising=False)
+    else:
+        monkeypatch.setenv('FMRIPREP_USE_SHM', env_value)
+
+    opts = get_parser().parse_args(['bids', 'out', 'participant'])
+    assert (Path('/dev/shm') in opts.work_dir.parents) is use_shm
+    assert get_parser().parse_args(
+        ['bids', 'out', 'participant', '-w', 'mywork']).work_dir == Path('mywork')
@@ -18,6 +18,7 @@ from copy import deepcopy
 
 from nipype import __version__ as nipype_ver
 from nipype.pipeline import engine as pe
+from nipype.pipeline.engine.utils import merge_dict
 from nipype.interfaces import utility as niu
 from niworkflows.interfaces.nilearn import NILEARN_VERSION
 
@@ -269,7 +270,7 @@ def init_fmriprep_wf(
             os.path.join(output_dir, "fmriprep", "sub-" + subject_id, 'log', run_uuid)
         )
         for node in single_subject_wf._get_all_nodes():
-            node.config = deepcopy(single_subject_wf.config)
+            node.config = merge_dict(deepcopy(single_subject_wf.config), node.config)
         if freesurfer:
             fmriprep_wf.connect(fsdir, 'subjects_dir',
                                 single_subject_wf, 'inputnode.subjects_dir')
@@ -18,7 +18,7 @@ import pkg_resources as pkgr
 
 from nipype.pipeline import engine as pe
 from nipype import logging
-from nipype.interfaces import utility as niu, fsl, c3
+from nipype.interfaces import utility as niu, c3
 from niworkflows.engine.workflows import LiterateWorkflow as Workflow
 # See https://github.com/poldracklab/fmriprep/issues/768
 from niworkflows.interfaces.freesurfer import (
@@ -363,7 +363,7 @@ def init_bold_t1_trans_wf(freesurfer, mem_gb, omp_nthreads, multiecho=False, use
     return workflow
 
 
-def init_bbreg_wf(use_bbr, bold2t1w_dof, omp_nthreads, name='bbreg_wf'):
+def init_bbreg_wf(use_bbr, bold2t1w_dof, omp_nthreads, use_mri_coreg=True, name='bbreg_wf'):
     """
     Build a workflow to run FreeSurfer's ``bbregister``.
 
@@ -381,6 +381,9 @@ def init_bbreg_wf(use_bbr, bold2t1w_dof, omp_nthreads, name='bbreg_wf'):
     will be compared to the initial transform found by ``mri_coreg``.
     Excessive deviation will result in rejecting the BBR refinement and
     accepting the original, affine registration.
+    If an initial registration is already available, ``use_mri_coreg=False``
+    skips ``mri_coreg`` altogether and seeds ``bbregister`` with ``init_reg_file``
+    instead (in this case, ``use_bbr`` cannot be ``False``).
 
     Workflow Graph
         .. workflow ::
@@ -398,6 +401,9 @@ def init_bbreg_wf(use_bbr, bold2t1w_dof, omp_nthreads, name='bbreg_wf'):
         If ``None``, test BBR result for distortion before accepting.
     bold2t1w_dof : 6, 9 or 12
         Degrees-of-freedom for BOLD-T1w registration
+    use_mri_coreg : bool, optional
+        Initialize ``bbregister`` with ``mri_coreg`` (default: True).
+        If ``False``, ``init_reg_file`` is used as initialization.
     name : str, optional
         Workflow name (default: bbreg_wf)
 
@@ -411,6 +417,9 @@ def init_bbreg_wf(use_bbr, bold2t1w_dof, omp_nthreads, name='bbreg_wf'):
         FreeSurfer SUBJECTS_DIR
     subject_id
         FreeSurfer subject ID (must have folder in SUBJECTS_DIR)
+    init_reg_file
+        LTA-style initial registration of ``in_file`` to the FreeSurfer subject
+        (only used if ``use_mri_coreg`` is ``False``)
     t1w_brain
         Unused (see :py:func:`~fmriprep.workflows.bold.registration.init_fsl_bbr_wf`)
     t1w_dseg
@@ -428,6 +437,13 @@ def init_bbreg_wf(use_bbr, bold2t1w_dof, omp_nthreads, name='bbreg_wf'):
         Boolean indicating whether BBR was rejected (mri_coreg registration returned)
 
     """
+    if not use_mri_coreg:
+        if use_bbr is False:
+            raise ValueError("Cannot disable both mri_coreg and BBR refinement")
+        if use_bbr is None:
+            LOGGER.warning("mri_coreg disabled - BBR refinement will be accepted without testing")
+            use_bbr = True
+
     workflow = Workflow(name=name)
     workflow.__desc__ = """\
 The BOLD reference was then co-registered to the T1w reference using
@@ -440,42 +456,46 @@ Co-registration was configured with {dof} degrees of freedom{reason}.
     inputnode = pe.Node(
         niu.IdentityInterface([
             'in_file',
-            'fsnative2t1w_xfm', 'subjects_dir', 'subject_id',  # BBRegister
+            'fsnative2t1w_xfm', 'subjects_dir', 'subject_id', 'init_reg_file',  # BBRegister
             't1w_dseg', 't1w_brain']),  # FLIRT BBR
         name='inputnode')
     outputnode = pe.Node(
         niu.IdentityInterface(['itk_bold_to_t1', 'itk_t1_to_bold', 'out_report', 'fallback']),
         name='outputnode')
 
-    mri_coreg = pe.Node(
-        MRICoregRPT(dof=bold2t1w_dof, sep=[4], ftol=0.0001, linmintol=0.01,
-                    generate_report=not use_bbr),
-        name='mri_coreg', n_procs=omp_nthreads, mem_gb=5)
+    if use_mri_coreg:
+        mri_coreg = pe.Node(
+            MRICoregRPT(dof=bold2t1w_dof, sep=[4], ftol=0.0001, linmintol=0.01,
+                        num_threads=omp_nthreads, generate_report=not use_bbr),
+            name='mri_coreg', n_procs=omp_nthreads, mem_gb=5)
+        workflow.connect([
+            (inputnode, mri_coreg, [('subjects_dir', 'subjects_dir'),
+                                    ('subject_id', 'subject_id'),
+                                    ('in_file', 'source_file')]),
+        ])
 
     lta_concat = pe.Node(ConcatenateLTA(out_file='out.lta'), name='lta_concat')
     # XXX LTA-FSL-ITK may ultimately be able to be replaced with a straightforward
     # LTA-ITK transform, but right now the translation parameters are off.
     lta2fsl_fwd = pe.Node(LTAConvert(out_fsl=True), name='lta2fsl_fwd')
-    lta2fsl_inv = pe.Node(LTAConvert(out_fsl=True, invert=True), name='lta2fsl_inv')
+    invt_fsl = pe.Node(niu.Function(function=_invert_fsl), name='invt_fsl',
+                       run_without_submitting=True, mem_gb=DEFAULT_MEMORY_MIN_GB)
     fsl2itk_fwd = pe.Node(c3.C3dAffineTool(fsl2ras=True, itk_transform=True),
                           name='fsl2itk_fwd', mem_gb=DEFAULT_MEMORY_MIN_GB)
     fsl2itk_inv = pe.Node(c3.C3dAffineTool(fsl2ras=True, itk_transform=True),
                           name='fsl2itk_inv', mem_gb=DEFAULT_MEMORY_MIN_GB)
 
     workflow.connect([
-        (inputnode, mri_coreg, [('subjects_dir', 'subjects_dir'),
-                                ('subject_id', 'subject_id'),
-                                ('in_file', 'source_file')]),
         # Output ITK transforms
         (inputnode, lta_concat, [('fsnative2t1w_xfm', 'in_lta2')]),
         (lta_concat, lta2fsl_fwd, [('out_file', 'in_lta')]),
-        (lta_concat, lta2fsl_inv, [('out_file', 'in_lta')]),
+        (lta2fsl_fwd, invt_fsl, [('out_fsl', 'in_file')]),
         (inputnode, fsl2itk_fwd, [('t1w_brain', 'reference_file'),
                                   ('in_file', 'source_file')]),
         (inputnode, fsl2itk_inv, [('in_file', 'reference_file'),
                                   ('t1w_brain', 'source_file')]),
         (lta2fsl_fwd, fsl2itk_fwd, [('out_fsl', 'transform_file')]),
-        (lta2fsl_inv, fsl2itk_inv, [('out_fsl', 'transform_file')]),
+        (invt_fsl, fsl2itk_inv, [('out', 'transform_file')]),
         (fsl2itk_fwd, outputnode, [('itk_transform', 'itk_bold_to_t1')]),
         (fsl2itk_inv, outputnode, [('itk_transform', 'itk_t1_to_bold')]),
     ])
@@ -498,9 +518,13 @@ Co-registration was configured with {dof} degrees of freedom{reason}.
         (inputnode, bbregister, [('subjects_dir', 'subjects_dir'),
                                  ('subject_id', 'subject_id'),
                                  ('in_file', 'source_file')]),
-        (mri_coreg, bbregister, [('out_lta_file', 'init_reg_file')]),
     ])
 
+    if use_mri_coreg:
+        workflow.connect([(mri_coreg, bbregister, [('out_lta_file', 'init_reg_file')])])
+    else:
+        workflow.connect([(inputnode, bbregister, [('init_reg_file', 'init_reg_file')])])
+
     # Short-circuit workflow building, use boundary-based registration
     if use_bbr is True:
         workflow.connect([
@@ -511,14 +535,16 @@ Co-registration was configured with {dof} degrees of freedom{reason}.
         return workflow
 
     transforms = pe.Node(niu.Merge(2), run_without_submitting=True, name='transforms')
-    reports = pe.Node(niu.Merge(2), run_without_submitting=True, name='reports')
 
     lta_ras2ras = pe.MapNode(LTAConvert(out_lta=True), iterfield=['in_lta'],
                              name='lta_ras2ras', mem_gb=2)
-    compare_transforms = pe.Node(niu.Function(function=compare_xforms), name='compare_transforms')
+    compare_transforms = pe.Node(niu.Function(function=compare_xforms), name='compare_transforms',
+                                 run_without_submitting=True, mem_gb=DEFAULT_MEMORY_MIN_GB)
 
-    select_transform = pe.Node(niu.Select(), run_without_submitting=True, name='select_transform')
-    select_report = pe.Node(niu.Select(), run_without_submitting=True, name='select_report')
+    select_transform = pe.Node(niu.Function(function=_pick), run_without_submitting=True,
+                               mem_gb=DEFAULT_MEMORY_MIN_GB, name='select_transform')
+    select_report = pe.Node(niu.Function(function=_pick), run_without_submitting=True,
+                            mem_gb=DEFAULT_MEMORY_MIN_GB, name='select_report')
 
     workflow.connect([
         (bbregister, transforms, [('out_lta_file', 'in1')]),
@@ -528,14 +554,14 @@ Co-registration was configured with {dof} degrees of freedom{reason}.
         (lta_ras2ras, compare_transforms, [('out_lta', 'lta_list')]),
         (compare_transforms, outputnode, [('out', 'fallback')]),
         # Select output transform
-        (transforms, select_transform, [('out', 'inlist')]),
-        (compare_transforms, select_transform, [('out', 'index')]),
+        (bbregister, select_transform, [('out_lta_file', 'bbr')]),
+        (mri_coreg, select_transform, [('out_lta_file', 'fallback')]),
+        (compare_transforms, select_transform, [('out', 'use_fallback')]),
         (select_transform, lta_concat, [('out', 'in_lta1')]),
         # Select output report
-        (bbregister, reports, [('out_report', 'in1')]),
-        (mri_coreg, reports, [('out_report', 'in2')]),
-        (reports, select_report, [('out', 'inlist')]),
-        (compare_transforms, select_report, [('out', 'index')]),
+        (bbregister, select_report, [('out_report', 'bbr')]),
+        (mri_coreg, select_report, [('out_report', 'fallback')]),
+        (compare_transforms, select_report, [('out', 'use_fallback')]),
         (select_report, outputnode, [('out', 'out_report')]),
     ])
 
@@ -593,6 +619,8 @@ def init_fsl_bbr_wf(use_bbr, bold2t1w_dof, name='fsl_bbr_wf'):
         Unused (see :py:func:`~fmriprep.workflows.bold.registration.init_bbreg_wf`)
     subject_id
         Unused (see :py:func:`~fmriprep.workflows.bold.registration.init_bbreg_wf`)
+    init_reg_file
+        Unused (see :py:func:`~fmriprep.workflows.bold.registration.init_bbreg_wf`)
 
     Outputs
     -------
@@ -618,19 +646,22 @@ for distortions remaining in the BOLD reference.
     inputnode = pe.Node(
         niu.IdentityInterface([
             'in_file',
-            'fsnative2t1w_xfm', 'subjects_dir', 'subject_id',  # BBRegister
+            'fsnative2t1w_xfm', 'subjects_dir', 'subject_id', 'init_reg_file',  # BBRegister
             't1w_dseg', 't1w_brain']),  # FLIRT BBR
         name='inputnode')
     outputnode = pe.Node(
         niu.IdentityInterface(['itk_bold_to_t1', 'itk_t1_to_bold', 'out_report', 'fallback']),
         name='outputnode')
 
-    wm_mask = pe.Node(niu.Function(function=extract_wm), name='wm_mask')
+    wm_mask = pe.Node(niu.Function(function=extract_wm), name='wm_mask',
+                      mem_gb=DEFAULT_MEMORY_MIN_GB)
+    # The mask depends only on the segmentation contents, allow cache hits across runs
+    wm_mask.config = {'execution': {'hash_method': 'content'}}
     flt_bbr_init = pe.Node(FLIRTRPT(dof=6, generate_report=not use_bbr,
                                     uses_qform=True), name='flt_bbr_init')
 
-    invt_bbr = pe.Node(fsl.ConvertXFM(invert_xfm=True), name='invt_bbr',
-                       mem_gb=DEFAULT_MEMORY_MIN_GB)
+    invt_bbr = pe.Node(niu.Function(function=_invert_fsl), name='invt_bbr',
+                       run_without_submitting=True, mem_gb=DEFAULT_MEMORY_MIN_GB)
 
     #  BOLD to T1 transform matrix is from fsl, using c3 tools to convert to
     #  something ANTs will like.
@@ -646,7 +677,7 @@ for distortions remaining in the BOLD reference.
                                   ('in_file', 'source_file')]),
         (inputnode, fsl2itk_inv, [('in_file', 'reference_file'),
                                   ('t1w_brain', 'source_file')]),
-        (invt_bbr, fsl2itk_inv, [('out_file', 'transform_file')]),
+        (invt_bbr, fsl2itk_inv, [('out', 'transform_file')]),
         (fsl2itk_fwd, outputnode, [('itk_transform', 'itk_bold_to_t1')]),
         (fsl2itk_inv, outputnode, [('itk_transform', 'itk_t1_to_bold')]),
     ])
@@ -694,12 +725,14 @@ for distortions remaining in the BOLD reference.
         return workflow
 
     transforms = pe.Node(niu.Merge(2), run_without_submitting=True, name='transforms')
-    reports = pe.Node(niu.Merge(2), run_without_submitting=True, name='reports')
 
-    compare_transforms = pe.Node(niu.Function(function=compare_xforms), name='compare_transforms')
+    compare_transforms = pe.Node(niu.Function(function=compare_xforms), name='compare_transforms',
+                                 run_without_submitting=True, mem_gb=DEFAULT_MEMORY_MIN_GB)
 
-    select_transform = pe.Node(niu.Select(), run_without_submitting=True, name='select_transform')
-    select_report = pe.Node(niu.Select(), run_without_submitting=True, name='select_report')
+    select_transform = pe.Node(niu.Function(function=_pick), run_without_submitting=True,
+                               mem_gb=DEFAULT_MEMORY_MIN_GB, name='select_transform')
+    select_report = pe.Node(niu.Function(function=_pick), run_without_submitting=True,
+                            mem_gb=DEFAULT_MEMORY_MIN_GB, name='select_report')
 
     fsl_to_lta = pe.MapNode(LTAConvert(out_lta=True), iterfield=['in_fsl'],
                             name='fsl_to_lta')
@@ -714,14 +747,15 @@ for distortions remaining in the BOLD reference.
         (fsl_to_lta, compare_transforms, [('out_lta', 'lta_list')]),
         (compare_transforms, outputnode, [('out', 'fallback')]),
         # Select output transform
-        (transforms, select_transform, [('out', 'inlist')]),
-        (compare_transforms, select_transform, [('out', 'index')]),
+        (flt_bbr, select_transform, [('out_matrix_file', 'bbr')]),
+        (flt_bbr_init, select_transform, [('out_matrix_file', 'fallback')]),
+        (compare_transforms, select_transform, [('out', 'use_fallback')]),
         (select_transform, invt_bbr, [('out', 'in_file')]),
         (select_transform, fsl2itk_fwd, [('out', 'transform_file')]),
-        (flt_bbr, reports, [('out_report', 'in1')]),
-        (flt_bbr_init, reports, [('out_report', 'in2')]),
-        (reports, select_report, [('out', 'inlist')]),
-        (compare_transforms, select_report, [('out', 'index')]),
+        # Select output report
+        (flt_bbr, select_report, [('out_report', 'bbr')]),
+        (flt_bbr_init, select_report, [('out_report', 'fallback')]),
+        (compare_transforms, select_report, [('out', 'use_fallback')]),
         (select_report, outputnode, [('out', 'out_report')]),
     ])
 
@@ -760,12 +794,41 @@ def compare_xforms(lta_list, norm_threshold=15):
           second transform relative to the first
 
     """
-    from niworkflows.interfaces.surf import load_transform
-    from nipype.algorithms.rapidart import _calc_norm_affine
+    import numpy as np
+
+    def _load_lta(fname):
+        # Parse the 4x4 matrix directly, sidestepping np.genfromtxt
+        with open(fname) as fobj:
+            for line in fobj:
+                if line.startswith('1 4 4'):
+                    break
+            values = ' '.join(fobj.readline() for _ in range(4)).split()
+        return np.array(values, dtype=np.float64).reshape(4, 4)
+
+    bbr_affine = _load_lta(lta_list[0])
+    fallback_affine = _load_lta(lta_list[1])
+
+    # Midpoints of the faces of the cube used by rapidart, in homogeneous coordinates
+    face_midpoints = np.array([[70., 0., 0., -70., 0., 0.],
+                               [0., 70., 0., 0., -110., 0.],
+                               [0., 0., 75., 0., 0., -45.],
+                               [1., 1., 1., 1., 1., 1.]])
+    displacement = (bbr_affine - fallback_affine)[:3].dot(face_midpoints)
+    norm = np.sqrt((displacement ** 2).sum(axis=0)).max()
+
+    return norm > norm_threshold
+
+
+def _invert_fsl(in_file):
+    """Invert an FSL-style affine matrix (the inverse mapping is the matrix inverse)."""
+    import os
+    import numpy as np
 
-    bbr_affine = load_transform(lta_list[0])
-    fallback_affine = load_transform(lta_list[1])
+    out_file = os.path.abspath('inverse.mat')
+    np.savetxt(out_file, np.linalg.inv(np.loadtxt(in_file)))
+    return out_file
 
-    norm, _ = _calc_norm_affine([fallback_affine, bbr_affine], use_differences=True)
 
-    return norm[1] > norm_threshold
+def _pick(bbr, fallback, use_fallback):
+    """Return ``fallback`` if ``use_fallback`` is true, ``bbr`` otherwise."""
+    return fallback if use_fallback else bbr
@@ -0,0 +1,75 @@
+''' Testing module for fmriprep.workflows.bold.registration '''
+import numpy as np
+import pytest
+
+from .. import registration
+from ..registration import compare_xforms, init_bbreg_wf
+
+
+LTA_TEMPLATE = """\
+# transform file
+type      = 1 # LINEAR_RAS_TO_RAS
+nxforms   = 1
+mean      = 0.0000 0.0000 0.0000
+sigma     = 1.0000
+1 4 4
+{}
+src volume info
+valid = 1  # volume info valid
+"""
+
+
+def _write_lta(path, affine):
+    path.write_text(LTA_TEMPLATE.format(
+        '\n'.join(' '.join('%.15e' % v for v in row) for row in affine)))
+    return str(path)
+
+
+@pytest.mark.parametrize('shift,expected', [
+    (0.0, False),
+    (10.0, False),
+    (20.0, True),
+])
+def test_compare_xforms_translation(tmp_path, shift, expected):
+    fallback = np.eye(4)
+    bbr = np.eye(4)
+    bbr[0, 3] = shift
+
+    lta_list = [_write_lta(tmp_path / 'bbr.lta', bbr),
+                _write_lta(tmp_path / 'fallback.lta', fallback)]
+    assert compare_xforms(lta_list) == expected
+
+
+def test_compare_xforms_scaling(tmp_path):
+    fallback = np.eye(4)
+    bbr = np.diag([1.0, 1.2, 1.0, 1.0])
+
+    lta_list = [_write_lta(tmp_path / 'bbr.lta', bbr),
+                _write_lta(tmp_path / 'fallback.lta', fallback)]
+    # Largest displacement is at the posterior face midpoint: 0.2 * 110mm
+    assert compare_xforms(lta_list, norm_threshold=21.9)
+    assert not compare_xforms(lta_list, norm_threshold=22.1)
+
+
+@pytest.mark.parametrize('use_bbr', [True, None])
+def test_bbreg_wf_no_mri_coreg(monkeypatch, use_bbr):
+    warnings = []
+    monkeypatch.setattr(registration.LOGGER, 'warning',
+                        lambda msg, *args: warnings.append(msg % args))
+
+    wf = init_bbreg_wf(use_bbr=use_bbr, bold2t1w_dof=6, omp_nthreads=1,
+                       use_mri_coreg=False)
+
+    assert wf.get_node('mri_coreg') is None
+    # BBR cannot be tested against a fallback, so it is always accepted
+    assert wf.get_node('compare_transforms') is None
+    assert wf.get_node('outputnode').inputs.fallback is False
+    assert bool(warnings) is (use_bbr is None)
+
+    edge = wf._graph.get_edge_data(wf.get_node('inputnode'), wf.get_node('bbregister'))
+    assert ('init_reg_file', 'init_reg_file') in edge['connect']
+
+
+def test_bbreg_wf_no_mri_coreg_no_bbr():
+    with pytest.raises(ValueError):
+        init_bbreg_wf(use_bbr=False, bold2t1w_dof=6, omp_nthreads=1, use_mri_coreg=False)